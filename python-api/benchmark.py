@@ -0,0 +1,203 @@
+# benchmark.py
+# Measures cold start, worker RSS and throughput of the API. Run it against two
+# checkouts to compare before/after, e.g. with a `git worktree` of the old commit:
+#   python benchmark.py startup [--app-dir ../old/python-api]
+#   python benchmark.py first-request [--app-dir ../old/python-api --port 5000]
+#   python benchmark.py load --url http://localhost:5000 --concurrency 16 --requests 200
+# The `gemini` client package is not public; when it is missing, a stub module
+# is put on PYTHONPATH so older code that imports it eagerly can still start.
+import argparse
+import base64
+import importlib.util
+import io
+import json
+import math
+import os
+import random
+import signal
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+STARTUP_SCRIPT = """
+import resource, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GEMINI_STUB = """
+class GeminiClient:
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+"""
+
+def app_env(**overrides):
+    """Environment for an app subprocess, with a gemini stub if the real one is missing"""
+    env = dict(os.environ, **overrides)
+    if importlib.util.find_spec("gemini") is None:
+        stub_dir = tempfile.mkdtemp(prefix="talkwise-bench-stub-")
+        with open(os.path.join(stub_dir, "gemini.py"), "w") as stub:
+            stub.write(GEMINI_STUB)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [stub_dir, env.get("PYTHONPATH")]))
+    return env
+
+# One request per lazily loaded route group
+ROUTE_GROUPS = [
+    ("audio", "POST", "/process-stream"),
+    ("transcript", "GET", "/transcript-stats"),
+    ("search", "GET", "/search-transcript?q=budget"),
+]
+
+def measure_startup(runs, app_dir):
+    """Time `import main` in fresh interpreters and report peak RSS"""
+    times, rss = [], []
+    env = app_env()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=app_dir, env=env,
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[-2]))
+        rss.append(int(output[-1]) / 1024)  # ru_maxrss is in KiB on Linux
+    print(f"import main: {min(times):.3f}s best, {sum(times) / runs:.3f}s mean over {runs} runs")
+    print(f"peak RSS after import: {max(rss):.1f} MiB")
+
+def process_rss(pid):
+    """Resident set size of a process and its children in MiB (Linux only).
+
+    Children matter for servers that fork, like Flask's debug reloader.
+    """
+    total = 0.0
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) / 1024
+        with open(f"/proc/{pid}/task/{pid}/children") as children:
+            total += sum(process_rss(int(child)) for child in children.read().split())
+    except FileNotFoundError:
+        pass
+    return total
+
+def measure_first_request(port, app_dir):
+    """Start a fresh server, then time the first request to each route group.
+
+    Lazy imports move cost from startup to these requests, so this is the other
+    half of the cold start picture.
+    """
+    env = app_env(PORT=str(port), WS_PORT="",
+                  STATE_LOCK_FILE=os.path.join(tempfile.gettempdir(), f"talkwise-bench-{port}.lock"),
+                  NOISE_PROFILE_DIR=tempfile.mkdtemp(prefix="talkwise-bench-"))
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=app_dir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              start_new_session=True)
+    url = f"http://localhost:{port}"
+    try:
+        while True:
+            try:
+                requests.get(url + "/health", timeout=1)
+                break
+            except requests.RequestException:
+                if server.poll() is not None:
+                    raise RuntimeError("Server exited during startup")
+                time.sleep(0.05)
+        print(f"server ready: {time.perf_counter() - start:.3f}s, RSS {process_rss(server.pid):.1f} MiB")
+
+        body = {"audio_chunk": make_chunk(), "sample_rate": 16000, "client_id": "first-request"}
+        for name, method, path in ROUTE_GROUPS:
+            for attempt in ("first", "second"):
+                started = time.perf_counter()
+                response = requests.request(method, url + path, json=body if method == "POST" else None)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{name} {attempt} request: {elapsed:.0f} ms (HTTP {response.status_code}), "
+                      f"RSS {process_rss(server.pid):.1f} MiB")
+    finally:
+        # Stop the whole process group, including reloader children
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+def make_chunk(seconds=1.0, sr=16000):
+    """Noisy tone as a base64 WAV, matching what the frontend sends"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sr)
+        frames = (
+            int(8000 * math.sin(2 * math.pi * 220 * i / sr) + random.gauss(0, 1500))
+            for i in range(int(seconds * sr))
+        )
+        wav.writeframes(b"".join(struct.pack("<h", max(-32768, min(32767, f))) for f in frames))
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+def measure_load(url, path, concurrency, total, client_ids):
+    """Fire `total` requests with `concurrency` in flight and report requests/sec.
+
+    client_ids: 'per-request' gives each request its own noise profile, 'shared'
+    sends every request for one client (serialized by the server), 'none' skips
+    noise profiles entirely.
+    """
+    chunk = make_chunk()
+    sessions = threading.local()  # requests.Session is not thread-safe
+
+    def send(index):
+        body = {"audio_chunk": chunk, "sample_rate": 16000}
+        if client_ids == "per-request":
+            body["client_id"] = f"benchmark-{index}"
+        elif client_ids == "shared":
+            body["client_id"] = "benchmark"
+        if not hasattr(sessions, "session"):
+            sessions.session = requests.Session()
+        start = time.perf_counter()
+        response = sessions.session.post(url + path, data=json.dumps(body),
+                                         headers={"Content-Type": "application/json"})
+        return response.status_code, time.perf_counter() - start
+
+    # Warm up lazy imports so they are not counted against throughput
+    send("warmup")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for status, _ in results if status != 200)
+    print(f"{total} requests, concurrency {concurrency}, client ids {client_ids}: "
+          f"{total / elapsed:.1f} req/s, "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms, {errors} errors")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    startup = subparsers.add_parser("startup")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--app-dir", default=APP_DIR)
+    first_request = subparsers.add_parser("first-request")
+    first_request.add_argument("--port", type=int, default=5099)
+    first_request.add_argument("--app-dir", default=APP_DIR)
+    load = subparsers.add_parser("load")
+    load.add_argument("--url", default="http://localhost:5000")
+    load.add_argument("--path", default="/process-stream")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--requests", type=int, default=200)
+    load.add_argument("--client-ids", choices=["per-request", "shared", "none"], default="per-request")
+    args = parser.parse_args()
+
+    if args.command == "startup":
+        measure_startup(args.runs, args.app_dir)
+    elif args.command == "first-request":
+        measure_first_request(args.port, args.app_dir)
+    else:
+        measure_load(args.url, args.path, args.concurrency, args.requests, args.client_ids)
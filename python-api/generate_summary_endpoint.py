@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import threading
 import time
+from transcript_index import TranscriptIndex
 
 @dataclass
 class TranscriptChunk:
@@ -23,6 +24,7 @@ class LiveTranscriptManager:
         self.lock = threading.Lock()
         self.auto_summary_enabled = True
         self.topic_keywords = []
+        self.search_index = TranscriptIndex()
         
     def add_transcript_chunk(self, text: str, speaker: str = None, confidence: float = 0.0):
         """Add new transcript chunk"""
@@ -34,12 +36,16 @@ class LiveTranscriptManager:
                 confidence=confidence
             )
             self.transcript_chunks.append(chunk)
+            self.search_index.add(chunk.text, chunk.timestamp, speaker)
             
             # Check if we need to auto-generate summary
-            if self.should_auto_generate_summary():
-                return self.generate_live_summary()
-            
-            return None
+            summary_due = self.should_auto_generate_summary()
+        
+        # Built after releasing the lock: generate_live_summary takes it again
+        if summary_due:
+            return self.generate_live_summary()
+        
+        return None
     
     def should_auto_generate_summary(self) -> bool:
         """Check if it's time to generate a new summary"""
@@ -66,22 +72,30 @@ class LiveTranscriptManager:
         with self.lock:
             return " ".join([chunk.text for chunk in self.transcript_chunks])
     
+    def search_transcript(self, query: str, speaker: str = None, start_time: datetime = None,
+                          end_time: datetime = None, limit: int = 50, offset: int = 0) -> Dict:
+        """Search transcript chunks by words, phrases and prefixes"""
+        with self.lock:
+            return self.search_index.search(query, speaker=speaker, start_time=start_time,
+                                            end_time=end_time, limit=limit, offset=offset)
+    
     def generate_live_summary(self) -> Dict:
         """Generate summary from current transcript"""
-        transcript_text = self.get_full_transcript()
-        
-        if len(transcript_text.strip()) < 50:  # Too short to summarize
-            return None
+        with self.lock:
+            transcript_text = " ".join([chunk.text for chunk in self.transcript_chunks])
             
-        # This will be called by the endpoint
-        self.last_summary_time = datetime.now()
-        
-        return {
-            "transcript": transcript_text,
-            "chunk_count": len(self.transcript_chunks),
-            "duration_minutes": self._get_session_duration(),
-            "last_updated": datetime.now().isoformat()
-        }
+            if len(transcript_text.strip()) < 50:  # Too short to summarize
+                return None
+                
+            # This will be called by the endpoint
+            self.last_summary_time = datetime.now()
+            
+            return {
+                "transcript": transcript_text,
+                "chunk_count": len(self.transcript_chunks),
+                "duration_minutes": self._get_session_duration(),
+                "last_updated": datetime.now().isoformat()
+            }
     
     def _get_session_duration(self) -> float:
         """Get total session duration in minutes"""
@@ -98,6 +112,7 @@ class LiveTranscriptManager:
         """Clear all transcript data"""
         with self.lock:
             self.transcript_chunks.clear()
+            self.search_index.clear()
             self.current_summary = None
             self.last_summary_time = datetime.now()
     
@@ -117,36 +132,31 @@ class LiveTranscriptManager:
             }
 
 # Enhanced generate_summary_endpoint.py
-from flask import request, jsonify
-import os
-import json
+# Framework agnostic: handlers take parsed request data and return
+# (payload, status) so main.py can run them on an executor.
 import os
-import json
-import requests
 from dotenv import load_dotenv
-from datetime import datetime
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Global transcript manager
 transcript_manager = LiveTranscriptManager()
 
-from dotenv import load_dotenv
-import os
-import json
-from datetime import datetime
-from gemini import GeminiClient  # Hypothetical Gemini AI client import
-from flask import request, jsonify
-
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+_gemini_client = None
+_gemini_client_lock = threading.Lock()
 
-# Initialize Gemini client with API key only
-gemini_client = GeminiClient(api_key=GEMINI_API_KEY)
+def get_gemini_client():
+    """Create the Gemini client on first use instead of at import time"""
+    global _gemini_client
+    with _gemini_client_lock:
+        if _gemini_client is None:
+            from gemini import GeminiClient  # Hypothetical Gemini AI client import
+            _gemini_client = GeminiClient(api_key=GEMINI_API_KEY)
+        return _gemini_client
 
-def generate_summary():
+def generate_summary(data):
     try:
-        data = request.get_json()
+        data = data or {}
         transcript = data.get('transcript', '').strip()
 
         # Option 1: Use provided transcript
@@ -161,7 +171,7 @@ def generate_summary():
             transcript = transcript_manager.get_recent_transcript(minutes)
 
         if not transcript:
-            return jsonify({"error": "No transcript available"}), 400
+            return {"error": "No transcript available"}, 400
 
         # Prepare prompt for Gemini AI
         meeting_context = data.get('meeting_context', {})
@@ -192,7 +202,7 @@ Respond ONLY with valid JSON.
 """
 
         # Call Gemini AI client chat completion
-        response = gemini_client.chat.completions.create(
+        response = get_gemini_client().chat.completions.create(
             model="gemini-2.0-flash",
             messages=[
                 {"role": "system", "content": "You are an expert meeting summarizer."},
@@ -212,10 +222,10 @@ Respond ONLY with valid JSON.
             try:
                 result = json.loads(response_text)
             except json.JSONDecodeError:
-                return jsonify({
+                return {
                     "error": f"JSON decode error: {str(json_error)}",
                     "raw_response": response_text
-                }), 500
+                }, 500
 
         # Ensure all expected fields exist
         summary_data = {
@@ -231,22 +241,22 @@ Respond ONLY with valid JSON.
             "transcript_stats": transcript_manager.get_transcript_stats()
         }
 
-        return jsonify(summary_data)
+        return summary_data, 200
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
 # New endpoints for live transcript management
-def add_transcript_chunk():
+def add_transcript_chunk(data):
     """Add new transcript chunk"""
     try:
-        data = request.get_json()
+        data = data or {}
         text = data.get('text', '').strip()
         speaker = data.get('speaker')
         confidence = data.get('confidence', 0.0)
         
         if not text:
-            return jsonify({"error": "Text is required"}), 400
+            return {"error": "Text is required"}, 400
             
         # Add to transcript manager
         auto_summary = transcript_manager.add_transcript_chunk(text, speaker, confidence)
@@ -262,40 +272,71 @@ def add_transcript_chunk():
             response["auto_summary_triggered"] = True
             response["summary_data"] = auto_summary
             
-        return jsonify(response)
+        return response, 200
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
-def get_live_transcript():
+def get_live_transcript(minutes=None):
     """Get current live transcript"""
     try:
-        minutes = request.args.get('recent_minutes', type=int)
         
         if minutes:
             transcript = transcript_manager.get_recent_transcript(minutes)
         else:
             transcript = transcript_manager.get_full_transcript()
             
-        return jsonify({
+        return {
             "transcript": transcript,
             "stats": transcript_manager.get_transcript_stats()
-        })
+        }, 200
         
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
 def clear_transcript():
     """Clear current transcript"""
     try:
         transcript_manager.clear_transcript()
-        return jsonify({"success": True, "message": "Transcript cleared"})
+        return {"success": True, "message": "Transcript cleared"}, 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
 def get_transcript_stats():
     """Get transcript statistics"""
     try:
-        return jsonify(transcript_manager.get_transcript_stats())
+        return transcript_manager.get_transcript_stats(), 200
+    except Exception as e:
+        return {"error": str(e)}, 500
+
+def search_transcript(query, speaker=None, start_time=None, end_time=None,
+                      recent_minutes=None, limit=50, offset=0):
+    """Search the live transcript"""
+    try:
+        query = (query or '').strip()
+        if not query:
+            return {"error": "Query parameter 'q' is required"}, 400
+
+        try:
+            start_time = datetime.fromisoformat(start_time) if start_time else None
+            end_time = datetime.fromisoformat(end_time) if end_time else None
+        except ValueError as e:
+            return {"error": f"Invalid time range: {str(e)}"}, 400
+        if recent_minutes:
+            start_time = datetime.now() - timedelta(minutes=recent_minutes)
+
+        results = transcript_manager.search_transcript(
+            query,
+            speaker=speaker,
+            start_time=start_time,
+            end_time=end_time,
+            limit=max(1, min(limit, 500)),
+            offset=max(offset, 0)
+        )
+        results["query"] = query
+        return results, 200
+
+    except ValueError as e:
+        return {"error": str(e)}, 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return {"error": str(e)}, 500
@@ -1,322 +1,246 @@
-from flask import Flask, request, jsonify, send_file
-from flask_cors import CORS
-import numpy as np
-import librosa
-import noisereduce as nr
-import soundfile as sf
-import io
-import base64
-import tempfile
+# Single ASGI service for the python-api. `python main.py` serves every route,
+# including /ws/transcribe, on PORT (default 5000) and also on WS_PORT (default
+# 8000, empty to disable) so clients of the old ws_server.py keep working.
+import asyncio
+import hashlib
+import importlib
+import json
 import os
-from generate_summary_endpoint import (
-    generate_summary
-)
-from scipy.signal import butter, filtfilt, savgol_filter
-from scipy.ndimage import median_filter
+import socket
+import tempfile
 import threading
-import time
-
-app = Flask(__name__)   
-CORS(app)  # Enable CORS for React frontend
-
-class NoiseReducer:
-    def __init__(self):
-        self.sample_rate = 16000  # Standard sample rate for speech
-        
-    def butter_bandpass_filter(self, data, lowcut=80, highcut=8000, fs=16000, order=5):
-        """Apply bandpass filter to remove frequencies outside speech range"""
-        nyquist = 0.5 * fs
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        b, a = butter(order, [low, high], btype='band')
-        return filtfilt(b, a, data)
-    
-    def spectral_gating(self, audio, sr, alpha=2.0, beta=0.15):
-        """Advanced spectral gating for noise reduction"""
-        # Convert to frequency domain
-        stft = librosa.stft(audio, hop_length=512, win_length=2048)
-        magnitude = np.abs(stft)
-        phase = np.angle(stft)
-        
-        # Estimate noise floor
-        noise_floor = np.percentile(magnitude, 20, axis=1, keepdims=True)
-        
-        # Create spectral gate
-        gate = np.where(
-            magnitude > alpha * noise_floor,
-            1.0,
-            beta * (magnitude / (alpha * noise_floor))
-        )
-        
-        # Apply gate
-        gated_stft = magnitude * gate * np.exp(1j * phase)
-        
-        # Convert back to time domain
-        return librosa.istft(gated_stft, hop_length=512, win_length=2048)
-    
-    def adaptive_wiener_filter(self, audio, sr, frame_length=2048, hop_length=512):
-        """Adaptive Wiener filtering for dynamic noise reduction"""
-        stft = librosa.stft(audio, hop_length=hop_length, win_length=frame_length)
-        magnitude = np.abs(stft)
-        phase = np.angle(stft)
-        
-        # Estimate noise spectrum from first 0.5 seconds
-        noise_frames = int(0.5 * sr / hop_length)
-        noise_spectrum = np.mean(magnitude[:, :noise_frames], axis=1, keepdims=True)
-        
-        # Calculate SNR
-        snr = magnitude / (noise_spectrum + 1e-10)
-        
-        # Wiener filter
-        wiener_gain = snr / (snr + 1)
-        
-        # Apply smoothing to gain
-        wiener_gain = savgol_filter(wiener_gain, window_length=5, polyorder=2, axis=1)
-        
-        # Apply filter
-        filtered_stft = magnitude * wiener_gain * np.exp(1j * phase)
-        
-        return librosa.istft(filtered_stft, hop_length=hop_length, win_length=frame_length)
-    
-    def multi_band_compressor(self, audio, sr, bands=4, ratios=[4, 6, 8, 10], 
-                             thresholds=[-20, -15, -10, -5]):
-        """Multi-band compression for dynamic range control"""
-        # Split into frequency bands
-        freqs = np.logspace(np.log10(80), np.log10(sr//2), bands+1)
-        
-        compressed_bands = []
-        for i in range(bands):
-            # Filter band
-            if i == 0:
-                # Low-pass for first band
-                band = self.butter_lowpass_filter(audio, freqs[i+1], sr)
-            elif i == bands-1:
-                # High-pass for last band
-                band = self.butter_highpass_filter(audio, freqs[i], sr)
-            else:
-                # Band-pass for middle bands
-                band = self.butter_bandpass_filter(audio, freqs[i], freqs[i+1], sr)
-            
-            # Apply compression
-            compressed_band = self.compress_audio(band, threshold=thresholds[i], 
-                                                 ratio=ratios[i])
-            compressed_bands.append(compressed_band)
-        
-        # Sum all bands
-        return np.sum(compressed_bands, axis=0)
-    
-    def butter_lowpass_filter(self, data, cutoff, fs, order=5):
-        nyquist = 0.5 * fs
-        normal_cutoff = cutoff / nyquist
-        b, a = butter(order, normal_cutoff, btype='low', analog=False)
-        return filtfilt(b, a, data)
-    
-    def butter_highpass_filter(self, data, cutoff, fs, order=5):
-        nyquist = 0.5 * fs
-        normal_cutoff = cutoff / nyquist
-        b, a = butter(order, normal_cutoff, btype='high', analog=False)
-        return filtfilt(b, a, data)
-    
-    def compress_audio(self, audio, threshold=-20, ratio=4, attack=0.003, release=0.1):
-        """Audio compressor"""
-        # Convert threshold from dB to linear
-        threshold_linear = 10 ** (threshold / 20)
-        
-        # Calculate envelope
-        envelope = np.abs(audio)
-        
-        # Apply compression
-        compressed = np.where(
-            envelope > threshold_linear,
-            threshold_linear + (envelope - threshold_linear) / ratio,
-            envelope
-        )
-        
-        # Maintain original sign
-        return compressed * np.sign(audio)
-    
-    def enhance_speech(self, audio, sr):
-        """Comprehensive speech enhancement pipeline"""
-        # 1. Normalize input
-        audio = audio / (np.max(np.abs(audio)) + 1e-10)
-        
-        # 2. Pre-emphasis filter
-        pre_emphasis = 0.97
-        audio = np.append(audio[0], audio[1:] - pre_emphasis * audio[:-1])
-        
-        # 3. Bandpass filter for speech frequencies
-        audio = self.butter_bandpass_filter(audio, lowcut=80, highcut=8000, fs=sr)
-        
-        # 4. Advanced noise reduction using noisereduce library
-        audio = nr.reduce_noise(y=audio, sr=sr, prop_decrease=0.8, stationary=False)
-        
-        # 5. Spectral gating
-        audio = self.spectral_gating(audio, sr, alpha=2.5, beta=0.1)
-        
-        # 6. Adaptive Wiener filtering
-        audio = self.adaptive_wiener_filter(audio, sr)
-        
-        # 7. Multi-band compression
-        audio = self.multi_band_compressor(audio, sr)
-        
-        # 8. Final normalization and limiting
-        audio = self.normalize_and_limit(audio)
-        
-        return audio
-    
-    def normalize_and_limit(self, audio, target_lufs=-23):
-        """Normalize audio to target LUFS and apply limiting"""
-        # Simple normalization to prevent clipping
-        peak = np.max(np.abs(audio))
-        if peak > 0:
-            audio = audio / peak * 0.95
-        
-        # Simple limiter
-        audio = np.tanh(audio)
-        
-        return audio
-    
-    def real_time_denoise(self, audio_chunk, sr):
-        """Optimized real-time denoising for streaming audio"""
-        # Quick and efficient denoising for real-time processing
-        
-        # 1. Bandpass filter
-        filtered = self.butter_bandpass_filter(audio_chunk, lowcut=100, highcut=7000, fs=sr)
-        
-        # 2. Simple spectral subtraction
-        stft = librosa.stft(filtered, hop_length=256, win_length=1024)
-        magnitude = np.abs(stft)
-        phase = np.angle(stft)
-        
-        # Estimate noise (use first 10% of frames)
-        noise_frames = max(1, magnitude.shape[1] // 10)
-        noise_spectrum = np.mean(magnitude[:, :noise_frames], axis=1, keepdims=True)
-        
-        # Spectral subtraction
-        alpha = 2.0
-        beta = 0.01
-        enhanced_magnitude = np.maximum(
-            magnitude - alpha * noise_spectrum,
-            beta * magnitude
+import weakref
+try:
+    import fcntl
+except ImportError:  # Windows dev machines
+    fcntl = None
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+# DSP and model work runs off the event loop. numpy/scipy release the GIL for
+# the heavy parts, and threads share the noise profile cache within the process.
+dsp_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DSP_WORKERS", os.cpu_count() or 4)),
+    thread_name_prefix="dsp"
+)
+# Whisper inference is already multi-threaded, so transcriptions run one at a time
+model_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+# Summary and transcript handlers are light or I/O bound and use the loop's default executor
+
+# The live transcript, its search index and the noise profile LRU live in this
+# process, so the service must run as a single worker: a chunk posted to one
+# worker would be invisible to searches on another, and a stale profile in one
+# worker would overwrite another's newer copy on disk. Scale DSP with
+# DSP_WORKERS instead. The lock file makes a second worker fail at startup; its
+# default path is derived from this checkout so separate checkouts do not clash.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_LOCK_FILE = os.getenv("STATE_LOCK_FILE", os.path.join(
+    tempfile.gettempdir(),
+    f"talkwise-api-{hashlib.sha1(APP_DIR.encode('utf-8')).hexdigest()[:12]}.lock"
+))
+
+def acquire_state_lock():
+    if fcntl is None:
+        return None
+    lock_file = open(STATE_LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        raise RuntimeError(
+            f"Another API process holds {STATE_LOCK_FILE}; transcript and noise profile "
+            "state is per process, so run a single worker"
         )
-        
-        # Reconstruct
-        enhanced_stft = enhanced_magnitude * np.exp(1j * phase)
-        enhanced_audio = librosa.istft(enhanced_stft, hop_length=256, win_length=1024)
-        
-        # 3. Simple compression
-        enhanced_audio = np.tanh(enhanced_audio * 2) * 0.8
-        
-        return enhanced_audio
-
-# Initialize noise reducer
-noise_reducer = NoiseReducer()
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    return jsonify({"status": "healthy", "message": "Noise cancellation API is running"})
-
-@app.route('/process-audio', methods=['POST'])
-def process_audio():
+    return lock_file
+
+# Noise profiles are written behind, not on every chunk
+NOISE_PROFILE_FLUSH_SECONDS = float(os.getenv("NOISE_PROFILE_FLUSH_SECONDS", "30"))
+
+def flush_noise_profiles():
+    """Write dirty noise profiles, if an audio route has loaded the cache"""
+    profiles = _backends.get("noise_profile")
+    if profiles is not None:
+        profiles.noise_profile_cache.flush()
+
+async def flush_noise_profiles_periodically():
+    while True:
+        await asyncio.sleep(NOISE_PROFILE_FLUSH_SECONDS)
+        try:
+            await run_in_executor(None, flush_noise_profiles)
+        except Exception as e:
+            print(f"Error flushing noise profiles: {e}")
+
+@asynccontextmanager
+async def lifespan(app):
+    state_lock = acquire_state_lock()
+    flush_task = asyncio.create_task(flush_noise_profiles_periodically())
+    yield
+    flush_task.cancel()
+    flush_noise_profiles()
+    dsp_executor.shutdown(wait=False)
+    model_executor.shutdown(wait=False)
+    if state_lock is not None:
+        state_lock.close()
+
+app = FastAPI(lifespan=lifespan)
+
+# Enable CORS for React frontend
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Heavy modules are imported on first use per route group, which keeps startup
+# fast and memory low until a route group is actually used. The import runs on
+# the default executor once; Python's import lock makes concurrent first imports
+# safe, and later requests get the module without an executor hop.
+_backends = {}
+
+async def load_backend(name):
+    module = _backends.get(name)
+    if module is None:
+        module = await run_in_executor(None, importlib.import_module, name)
+        _backends[name] = module
+    return module
+
+async def audio_backend():
+    return await load_backend("noise_reducer")  # numpy, scipy, librosa, noisereduce
+
+async def profile_backend():
+    return await load_backend("noise_profile")  # numpy only, for profile management
+
+async def summary_backend():
+    return await load_backend("generate_summary_endpoint")  # Gemini client is created on first summary
+
+# Requests for the same noise profile wait here rather than on the profile's
+# thread lock, so one client's burst of chunks cannot park every DSP thread
+_profile_locks = weakref.WeakValueDictionary()
+
+def profile_lock(key):
+    if key is None:
+        return nullcontext()
+    lock = _profile_locks.get(key)
+    if lock is None:
+        lock = _profile_locks[key] = asyncio.Lock()
+    return lock
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+def get_whisper_model():
+    global _whisper_model
+    with _whisper_lock:
+        if _whisper_model is None:
+            import whisper
+            _whisper_model = whisper.load_model(os.getenv("WHISPER_MODEL", "base"))
+        return _whisper_model
+
+async def run_in_executor(executor, func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+async def read_json(request: Request):
+    """Parsed JSON object body, or None for a missing, invalid or non-object body"""
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def respond(result):
+    payload, status = result
+    return JSONResponse(payload, status_code=status)
+
+@app.get('/health')
+async def health_check():
+    return {"status": "healthy", "message": "Noise cancellation API is running"}
+
+@app.post('/process-audio')
+async def process_audio(request: Request):
     try:
-        data = request.get_json()
-        
+        data = await read_json(request)
+
         if not data or 'audio_data' not in data:
-            return jsonify({"error": "No audio data provided"}), 400
-        
-        # Decode base64 audio data
-        audio_data = base64.b64decode(data['audio_data'])
-        
+            return JSONResponse({"error": "No audio data provided"}, status_code=400)
+
         # Get processing parameters
         mode = data.get('mode', 'full')  # 'full' or 'realtime'
         sample_rate = data.get('sample_rate', 16000)
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_file.write(audio_data)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Load audio
-            audio, sr = librosa.load(tmp_file_path, sr=sample_rate)
-            
-            # Process based on mode
-            if mode == 'realtime':
-                processed_audio = noise_reducer.real_time_denoise(audio, sr)
-            else:
-                processed_audio = noise_reducer.enhance_speech(audio, sr)
-            
-            # Create output file
-            output_buffer = io.BytesIO()
-            sf.write(output_buffer, processed_audio, sr, format='WAV')
-            output_buffer.seek(0)
-            
-            # Encode to base64
-            processed_audio_b64 = base64.b64encode(output_buffer.read()).decode('utf-8')
-            
-            return jsonify({
-                "success": True,
-                "processed_audio": processed_audio_b64,
-                "sample_rate": sr,
-                "duration": len(processed_audio) / sr,
-                "processing_mode": mode
-            })
-            
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
-            
+        if mode not in ('realtime', 'full'):
+            mode = 'full'
+
+        backend = await audio_backend()
+        key = (await profile_backend()).request_profile_key(data)
+        async with profile_lock(key):
+            processed_audio_b64, sr, duration = await run_in_executor(
+                dsp_executor, backend.process_audio, data['audio_data'], sample_rate, mode, key
+            )
+
+        return {
+            "success": True,
+            "processed_audio": processed_audio_b64,
+            "sample_rate": sr,
+            "duration": duration,
+            "processing_mode": mode
+        }
+
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return JSONResponse({"error": str(e)}, status_code=500)
 
-@app.route('/process-stream', methods=['POST'])
-def process_audio_stream():
+@app.post('/process-stream')
+async def process_audio_stream(request: Request):
     """Process audio in real-time streaming mode"""
     try:
-        data = request.get_json()
-        
+        data = await read_json(request)
+
         if not data or 'audio_chunk' not in data:
-            return jsonify({"error": "No audio chunk provided"}), 400
-        
-        # Decode audio chunk
-        audio_chunk_data = base64.b64decode(data['audio_chunk'])
+            return JSONResponse({"error": "No audio chunk provided"}, status_code=400)
+
         sample_rate = data.get('sample_rate', 16000)
-        
-        # Create temporary file for chunk
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_file.write(audio_chunk_data)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Load audio chunk
-            audio_chunk, sr = librosa.load(tmp_file_path, sr=sample_rate)
-            
-            # Process with real-time optimized algorithm
-            processed_chunk = noise_reducer.real_time_denoise(audio_chunk, sr)
-            
-            # Encode processed chunk
-            output_buffer = io.BytesIO()
-            sf.write(output_buffer, processed_chunk, sr, format='WAV')
-            output_buffer.seek(0)
-            
-            processed_chunk_b64 = base64.b64encode(output_buffer.read()).decode('utf-8')
-            
-            return jsonify({
-                "success": True,
-                "processed_chunk": processed_chunk_b64,
-                "chunk_duration": len(processed_chunk) / sr
-            })
-            
-        finally:
-            os.unlink(tmp_file_path)
-            
+
+        # Process with real-time optimized algorithm
+        backend = await audio_backend()
+        key = (await profile_backend()).request_profile_key(data)
+        async with profile_lock(key):
+            processed_chunk_b64, _, duration = await run_in_executor(
+                dsp_executor, backend.process_audio, data['audio_chunk'], sample_rate, 'realtime', key
+            )
+
+        return {
+            "success": True,
+            "processed_chunk": processed_chunk_b64,
+            "chunk_duration": duration
+        }
+
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return JSONResponse({"error": str(e)}, status_code=500)
 
-@app.route('/get-settings', methods=['GET'])
-def get_noise_reduction_settings():
+@app.delete('/noise-profile')
+async def reset_noise_profile(request: Request):
+    """Forget the learned noise profile for a client/room/device"""
+    data = await read_json(request) or dict(request.query_params)
+    backend = await profile_backend()
+    key = backend.request_profile_key(data)
+    if key is None:
+        return JSONResponse({"error": "client_id, room_id or device_id is required"}, status_code=400)
+
+    async with profile_lock(key):
+        removed = await run_in_executor(dsp_executor, backend.reset_noise_profiles, key)
+    return {"success": True, "removed": removed}
+
+@app.get('/get-settings')
+async def get_noise_reduction_settings():
     """Get available noise reduction settings"""
-    return jsonify({
+    return {
         "modes": [
             {
                 "id": "realtime",
@@ -334,15 +258,87 @@ def get_noise_reduction_settings():
             "mode": "realtime",
             "sample_rate": 16000,
             "chunk_size": 1024
-        }
-    })
+        },
+        "noise_profile_keys": ["client_id", "room_id", "device_id"]
+    }
+
+@app.post('/generate-summary')
+async def generate_summary_route(request: Request):
+    data = await read_json(request)
+    backend = await summary_backend()
+    return respond(await run_in_executor(None, backend.generate_summary, data))
 
-from generate_summary_endpoint import generate_summary
-from flask import request
+@app.post('/transcript')
+async def add_transcript_chunk_route(request: Request):
+    data = await read_json(request)
+    backend = await summary_backend()
+    return respond(await run_in_executor(None, backend.add_transcript_chunk, data))
 
-@app.route('/generate-summary', methods=['POST'])
-def generate_summary_route():
-    return generate_summary()
+@app.get('/transcript')
+async def get_live_transcript_route(recent_minutes: int = None):
+    backend = await summary_backend()
+    return respond(await run_in_executor(None, backend.get_live_transcript, recent_minutes))
+
+@app.delete('/transcript')
+async def clear_transcript_route():
+    backend = await summary_backend()
+    return respond(await run_in_executor(None, backend.clear_transcript))
+
+@app.get('/transcript-stats')
+async def get_transcript_stats_route():
+    backend = await summary_backend()
+    return respond(await run_in_executor(None, backend.get_transcript_stats))
+
+@app.get('/search-transcript')
+async def search_transcript_route(q: str = '', speaker: str = None, start_time: str = None,
+                                  end_time: str = None, recent_minutes: int = None,
+                                  limit: int = 50, offset: int = 0):
+    backend = await summary_backend()
+    return respond(await run_in_executor(
+        None, backend.search_transcript, q, speaker=speaker, start_time=start_time,
+        end_time=end_time, recent_minutes=recent_minutes, limit=limit, offset=offset
+    ))
+
+def transcribe_file(audio_bytes):
+    """Transcribe buffered audio with Whisper; runs on the model executor"""
+    # Save buffer to temp file for transcription
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp_file:
+        tmp_file.write(audio_bytes)
+        tmp_filename = tmp_file.name
+
+    try:
+        result = get_whisper_model().transcribe(tmp_filename, language="id", fp16=False)
+        return result.get("text", "")
+    finally:
+        # Remove temp file
+        os.remove(tmp_filename)
+
+@app.websocket("/ws/transcribe")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+    audio_buffer = bytearray()
+    try:
+        while True:
+            data = await websocket.receive_bytes()
+            audio_buffer.extend(data)
+
+            # Transcribe audio file using Whisper
+            transcript_text = await run_in_executor(model_executor, transcribe_file, bytes(audio_buffer))
+
+            # Send transcript back to client
+            response = {
+                "transcript": transcript_text.strip()
+            }
+            await websocket.send_text(json.dumps(response))
+
+            # Clear buffer after transcription to avoid reprocessing same audio
+            audio_buffer.clear()
+
+    except WebSocketDisconnect:
+        print("WebSocket disconnected")
+    except Exception as e:
+        print(f"Error: {e}")
+        await websocket.close()
 
 if __name__ == '__main__':
     print("Starting Noise Cancellation API Server...")
@@ -350,8 +346,30 @@ if __name__ == '__main__':
     print("- GET /health - Health check")
     print("- POST /process-audio - Process complete audio file")
     print("- POST /process-stream - Process audio stream chunks")
+    print("- DELETE /noise-profile - Reset a cached noise profile")
     print("- GET /get-settings - Get available settings")
     print("- POST /generate-summary - Generate AI summary from transcript")
-    
-    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
-    print("Server is running...")
+    print("- POST/GET/DELETE /transcript - Add to, read or clear the live transcript")
+    print("- GET /transcript-stats - Live transcript statistics")
+    print("- GET /search-transcript - Search live transcript by words, phrases and time range")
+    print("- WS /ws/transcribe - Live Whisper transcription")
+
+    host = "0.0.0.0"
+    ports = [int(os.getenv("PORT", "5000"))]
+    ws_port = os.getenv("WS_PORT", "8000")
+    if ws_port and int(ws_port) not in ports:
+        ports.append(int(ws_port))
+
+    # One process and one server for every port, so they share the state lock
+    # and transcript state. Single worker on purpose, see STATE_LOCK_FILE above.
+    sockets = []
+    for port in ports:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sockets.append(sock)
+    print(f"Listening on ports {', '.join(str(port) for port in ports)}")
+    try:
+        uvicorn.Server(uvicorn.Config(app, host=host, port=ports[0])).run(sockets=sockets)
+    except KeyboardInterrupt:
+        pass  # Already shut down cleanly; uvicorn re-raises the signal
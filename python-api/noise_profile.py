@@ -0,0 +1,305 @@
+# noise_profile.py
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class NoiseProfile:
+    """Compact noise estimate for one client/room/device and processing stage.
+
+    Spectra are stored as power per unit window gain so a profile learned with
+    one STFT window length can be reused by a stage that uses another.
+    """
+    key: str
+    sample_rate: int
+    n_fft: int
+    noise_psd: np.ndarray
+    smoothed_psd: np.ndarray
+    current_min: np.ndarray
+    min_buffer: np.ndarray
+    subwindow_frames: int = 0
+    frames_observed: int = 0
+    updated_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @classmethod
+    def empty(cls, key: str, sample_rate: int, n_fft: int = 2048, subwindows: int = 8):
+        bins = n_fft // 2 + 1
+        return cls(
+            key=key,
+            sample_rate=sample_rate,
+            n_fft=n_fft,
+            noise_psd=np.zeros(bins, dtype=np.float32),
+            smoothed_psd=np.zeros(bins, dtype=np.float32),
+            current_min=np.full(bins, np.inf, dtype=np.float32),
+            min_buffer=np.full((subwindows, bins), np.inf, dtype=np.float32),
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self.frames_observed > 0
+
+    def matches(self, sample_rate: int, n_fft: int) -> bool:
+        return self.sample_rate == sample_rate and self.n_fft == n_fft
+
+    def reset(self, sample_rate: int, n_fft: int = 2048):
+        """Discard the learned state, e.g. when the stream format changes"""
+        fresh = NoiseProfile.empty(self.key, sample_rate, n_fft, len(self.min_buffer))
+        for name in ("sample_rate", "n_fft", "noise_psd", "smoothed_psd", "current_min",
+                     "min_buffer", "subwindow_frames", "frames_observed", "updated_at"):
+            setattr(self, name, getattr(fresh, name))
+
+    def noise_magnitude(self, win_length: int) -> np.ndarray:
+        """Noise magnitude spectrum scaled for an STFT with the given window length"""
+        return (np.sqrt(self.noise_psd) * window_gain(win_length))[:, np.newaxis]
+
+
+def window_gain(win_length: int) -> float:
+    """Sum of the periodic Hann window librosa.stft applies for this window length"""
+    n = np.arange(win_length)
+    return float(np.sum(0.5 - 0.5 * np.cos(2 * np.pi * n / win_length)))
+
+
+def profile_key(client_id: Optional[str] = None, room_id: Optional[str] = None,
+                device_id: Optional[str] = None) -> Optional[str]:
+    """Build a cache key from request identifiers, or None if none were given"""
+    parts = [client_id, room_id, device_id]
+    if not any(parts):
+        return None
+    return "/".join(str(part) if part else "-" for part in parts)
+
+
+class MinimumStatisticsEstimator:
+    """Continuous noise estimation with minimum statistics.
+
+    Every frame feeds the smoothed periodogram and the minimum search, so the
+    estimate follows a rising noise floor once the old minima leave the window.
+    The VAD only slows smoothing over speech frames.
+    """
+
+    def __init__(self, alpha: float = 0.85, speech_alpha: float = 0.96, subwindow_length: int = 16,
+                 bias: float = 1.5, vad_threshold: float = 3.0, vad_floor: float = 1e-12,
+                 cold_start_percentile: float = 20):
+        self.alpha = alpha  # Recursive smoothing of the periodogram on noise frames
+        self.speech_alpha = speech_alpha  # Slower smoothing while the VAD detects speech
+        self.subwindow_length = subwindow_length  # Frames per minimum-tracking subwindow
+        self.bias = bias  # Compensates the downward bias of a minimum of smoothed power
+        self.vad_threshold = vad_threshold  # Frame energy above noise energy counted as speech
+        self.vad_floor = vad_floor  # Keeps the VAD usable after digital silence
+        self.cold_start_percentile = cold_start_percentile
+
+    def silent_frames(self, profile: NoiseProfile, power: np.ndarray) -> np.ndarray:
+        """Simple energy VAD relative to the current noise estimate"""
+        frame_energy = np.sum(power, axis=0)
+        if profile.is_ready:
+            threshold = max(self.vad_threshold * float(np.sum(profile.noise_psd)), self.vad_floor)
+            return frame_energy <= threshold
+        # No estimate yet: treat the quietest frames of this chunk as noise
+        return frame_energy <= np.percentile(frame_energy, self.cold_start_percentile)
+
+    def update(self, profile: NoiseProfile, magnitude: np.ndarray, sr: int,
+               win_length: int, n_fft: int = 2048, gain: float = 1.0) -> np.ndarray:
+        """Feed STFT magnitude frames into the profile and return the noise magnitude
+        spectrum scaled for the caller's STFT.
+
+        gain is any scaling the caller applied to its input (e.g. peak normalization),
+        so the profile stays on the scale of the raw signal across requests.
+        """
+        if not profile.matches(sr, n_fft):
+            profile.reset(sr, n_fft)
+
+        power = (magnitude / (window_gain(win_length) * gain)) ** 2
+        if not power.shape[1]:
+            return profile.noise_magnitude(win_length) * gain
+        silent = self.silent_frames(profile, power)
+
+        for frame, is_silent in zip(power.T, silent):
+            if profile.frames_observed == 0:
+                profile.smoothed_psd = frame.astype(np.float32)
+            else:
+                alpha = self.alpha if is_silent else self.speech_alpha
+                profile.smoothed_psd = (alpha * profile.smoothed_psd
+                                        + (1 - alpha) * frame).astype(np.float32)
+            profile.current_min = np.minimum(profile.current_min, profile.smoothed_psd)
+            profile.subwindow_frames += 1
+            profile.frames_observed += 1
+
+            # Roll the finished subwindow minimum into the search window
+            if profile.subwindow_frames >= self.subwindow_length:
+                profile.min_buffer = np.roll(profile.min_buffer, 1, axis=0)
+                profile.min_buffer[0] = profile.current_min
+                profile.current_min = np.full_like(profile.current_min, np.inf)
+                profile.subwindow_frames = 0
+
+        # Minimum over the finished subwindows plus the one in progress
+        minimum = np.minimum(profile.current_min, np.min(profile.min_buffer, axis=0))
+        profile.noise_psd = (self.bias * minimum).astype(np.float32)
+        profile.updated_at = time.time()
+
+        return profile.noise_magnitude(win_length) * gain
+
+
+class NoiseProfileCache:
+    """LRU of noise profiles keyed by client/room/device id, persisted to disk.
+
+    Updated profiles are marked dirty and written on eviction or by flush(),
+    which the server calls on a timer and at shutdown, so streaming requests
+    never wait on disk. delete() removes the file immediately.
+    """
+
+    def __init__(self, directory: Optional[str] = None, capacity: int = 256):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "talkwise-noise-profiles")
+        self.capacity = capacity
+        self.profiles: "OrderedDict[str, NoiseProfile]" = OrderedDict()
+        self.dirty: set = set()
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    def get(self, key: str, sample_rate: int, n_fft: int = 2048) -> NoiseProfile:
+        """Return the cached profile for key, loading it from disk or creating it"""
+        with self.lock:
+            profile = self.profiles.get(key)
+            if profile is not None:
+                self.profiles.move_to_end(key)
+                return profile
+
+            profile = self._load(key) or NoiseProfile.empty(key, sample_rate, n_fft)
+            self.profiles[key] = profile
+            evicted = []
+            while len(self.profiles) > self.capacity:
+                evicted_key, evicted_profile = self.profiles.popitem(last=False)
+                if evicted_key in self.dirty:
+                    self.dirty.discard(evicted_key)
+                    evicted.append(evicted_profile)
+
+        # Write evicted profiles outside the cache lock so other lookups are not blocked
+        for evicted_profile in evicted:
+            with evicted_profile.lock:
+                self.save(evicted_profile)
+        return profile
+
+    def mark_dirty(self, profile: NoiseProfile):
+        """Record that a profile changed and needs writing on the next flush"""
+        with self.lock:
+            if self.profiles.get(profile.key) is profile:
+                self.dirty.add(profile.key)
+
+    def flush(self):
+        """Write every dirty profile to disk"""
+        with self.lock:
+            keys, self.dirty = self.dirty, set()
+
+        for key in keys:
+            profile = self.profiles.get(key)
+            if profile is None:
+                continue
+            with profile.lock:
+                # Skip profiles deleted or evicted since the snapshot
+                if self.profiles.get(key) is profile:
+                    self.save(profile)
+
+    def save(self, profile: NoiseProfile):
+        """Write a profile to disk atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.savez(
+                    tmp_file,
+                    key=np.array(profile.key),
+                    sample_rate=profile.sample_rate,
+                    n_fft=profile.n_fft,
+                    noise_psd=profile.noise_psd,
+                    smoothed_psd=profile.smoothed_psd,
+                    current_min=profile.current_min,
+                    min_buffer=profile.min_buffer,
+                    subwindow_frames=profile.subwindow_frames,
+                    frames_observed=profile.frames_observed,
+                    updated_at=profile.updated_at,
+                )
+                # Make the data durable before the rename, or a crash can leave an empty file
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, self._path(profile.key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _load(self, key: str) -> Optional[NoiseProfile]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                if str(data["key"]) != key:
+                    return None
+                return NoiseProfile(
+                    key=key,
+                    sample_rate=int(data["sample_rate"]),
+                    n_fft=int(data["n_fft"]),
+                    noise_psd=data["noise_psd"],
+                    smoothed_psd=data["smoothed_psd"],
+                    current_min=data["current_min"],
+                    min_buffer=data["min_buffer"],
+                    subwindow_frames=int(data["subwindow_frames"]),
+                    frames_observed=int(data["frames_observed"]),
+                    updated_at=float(data["updated_at"]),
+                )
+        except Exception:
+            # Corrupt, truncated or outdated file (BadZipFile, EOFError, ...):
+            # start over rather than fail the request
+            return None
+
+    def delete(self, key: str) -> bool:
+        """Forget a profile in memory and on disk"""
+        with self.lock:
+            profile = self.profiles.pop(key, None)
+            self.dirty.discard(key)
+
+        removed = profile is not None
+        # Wait for an in-flight flush of this profile so it cannot recreate the file
+        with profile.lock if profile is not None else nullcontext():
+            path = self._path(key)
+            if os.path.exists(path):
+                os.unlink(path)
+                removed = True
+        return removed
+
+
+# Process-wide cache. It lives here rather than in noise_reducer so profile
+# management does not load the DSP stack.
+noise_profile_cache = NoiseProfileCache(
+    directory=os.getenv("NOISE_PROFILE_DIR"),
+    capacity=int(os.getenv("NOISE_PROFILE_CACHE_SIZE", "256"))
+)
+
+NOISE_PROFILE_STAGES = {
+    "realtime": ["realtime"],
+    "full": ["gating", "wiener"]
+}
+
+
+def request_profile_key(data) -> Optional[str]:
+    return profile_key(data.get("client_id"), data.get("room_id"), data.get("device_id"))
+
+
+def reset_noise_profiles(key: str) -> bool:
+    """Forget every stage profile learned for a client/room/device"""
+    removed = False
+    for stages in NOISE_PROFILE_STAGES.values():
+        for stage in stages:
+            removed = noise_profile_cache.delete(f"{key}:{stage}") or removed
+    return removed
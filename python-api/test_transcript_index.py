@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from transcript_index import TranscriptIndex
+
+START = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def index():
+    index = TranscriptIndex()
+    index.add("Budget review with Andi about the marketing budget", START, "A")
+    index.add("Next we discuss budgeting for Q3", START + timedelta(minutes=1), "B")
+    index.add("Andi agrees the marketing budget is final", START + timedelta(minutes=2), "A")
+    return index
+
+
+def chunk_ids(response):
+    return [result["chunk_id"] for result in response["results"]]
+
+
+def test_word_query_is_case_insensitive(index):
+    response = index.search("BUDGET")
+    assert chunk_ids(response) == [0, 2]
+    assert response["total"] == 2
+
+
+def test_prefix_query_matches_longer_words(index):
+    assert chunk_ids(index.search("budget*")) == [0, 1, 2]
+
+
+def test_short_prefix_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.search("b*")
+
+
+def test_phrase_requires_adjacent_words(index):
+    assert chunk_ids(index.search('"marketing budget"')) == [0, 2]
+    assert chunk_ids(index.search('"budget marketing"')) == []
+
+
+def test_terms_are_anded(index):
+    assert chunk_ids(index.search("andi final")) == [2]
+
+
+def test_speaker_filter(index):
+    assert chunk_ids(index.search("budget*", speaker="B")) == [1]
+
+
+def test_time_range_filter(index):
+    response = index.search("budget*", start_time=START + timedelta(seconds=30),
+                            end_time=START + timedelta(minutes=1))
+    assert chunk_ids(response) == [1]
+
+
+def test_offset_and_limit_page_through_matches(index):
+    assert chunk_ids(index.search("budget*", limit=2)) == [0, 1]
+    response = index.search("budget*", limit=2, offset=2)
+    assert chunk_ids(response) == [2]
+    assert response["total"] == 3
+
+
+def test_phrase_offset_skips_only_verified_matches(index):
+    response = index.search('"marketing budget"', offset=1)
+    assert chunk_ids(response) == [2]
+    assert response["total"] == 2
+    assert response["total_exact"]
+
+
+def test_highlights_point_at_matches(index):
+    result = index.search('"marketing budget"')["results"][0]
+    start, end = result["highlights"][0]
+    assert result["snippet"][start:end] == "marketing budget"
+
+
+def test_clear_empties_index(index):
+    index.clear()
+    assert len(index) == 0
+    assert index.search("budget")["total"] == 0
@@ -0,0 +1,224 @@
+# transcript_index.py
+import re
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+@dataclass
+class QueryTerm:
+    tokens: List[str]
+    prefix: bool = False  # Last token matches as a prefix
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Split text into lowercase tokens with their character spans"""
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+def parse_query(query: str) -> List[QueryTerm]:
+    """Parse a query into AND-ed terms: words, "quoted phrases" and prefix* terms"""
+    terms = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        raw = phrase or word
+        prefix = raw.endswith("*")
+        tokens = [token for token, _, _ in tokenize(raw)]
+        if tokens:
+            terms.append(QueryTerm(tokens=tokens, prefix=prefix))
+    return terms
+
+
+class TranscriptIndex:
+    """Incrementally updated inverted index over transcript chunks.
+
+    Chunks arrive in time order, so chunk ids, timestamps and every posting list
+    stay sorted and time ranges resolve to chunk id ranges with a bisect. Queries
+    intersect chunk ids only; phrase checks and highlights re-tokenize just the
+    chunks that end up on the returned page.
+    """
+
+    MIN_PREFIX_LENGTH = 2
+    MAX_PREFIX_EXPANSIONS = 256
+
+    def __init__(self):
+        self.postings: Dict[str, List[int]] = {}  # token -> chunk ids
+        self.vocabulary: List[str] = []  # Sorted, for prefix lookups
+        self.texts: List[str] = []
+        self.timestamps: List[float] = []
+        self.speakers: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, text: str, timestamp: datetime, speaker: Optional[str] = None) -> int:
+        """Index one chunk and return its chunk id"""
+        chunk_id = len(self.texts)
+
+        for token in {token for token, _, _ in tokenize(text)}:
+            if token not in self.postings:
+                self.postings[token] = []
+                insort(self.vocabulary, token)
+            self.postings[token].append(chunk_id)
+
+        self.texts.append(text)
+        self.timestamps.append(timestamp.timestamp())
+        self.speakers.append(speaker)
+        return chunk_id
+
+    def clear(self):
+        self.__init__()
+
+    def _expand(self, token: str, prefix: bool) -> Tuple[List[str], bool]:
+        """Vocabulary entries a query token matches, and whether a prefix was capped"""
+        if not prefix:
+            return ([token] if token in self.postings else []), False
+        if len(token) < self.MIN_PREFIX_LENGTH:
+            raise ValueError(f"Prefix queries need at least {self.MIN_PREFIX_LENGTH} characters")
+        start = bisect_left(self.vocabulary, token)
+        end = bisect_left(self.vocabulary, token + "\uffff")
+        capped = end - start > self.MAX_PREFIX_EXPANSIONS
+        return self.vocabulary[start:min(end, start + self.MAX_PREFIX_EXPANSIONS)], capped
+
+    def _chunk_ids(self, tokens: List[str], lo: int, hi: int) -> set:
+        """Chunk ids within [lo, hi) containing any of the tokens"""
+        chunk_ids = set()
+        for token in tokens:
+            postings = self.postings[token]
+            chunk_ids.update(postings[bisect_left(postings, lo):bisect_left(postings, hi)])
+        return chunk_ids
+
+    def _candidates(self, term: QueryTerm, lo: int, hi: int) -> Tuple[set, bool]:
+        """Chunk ids containing every token of a term, ignoring word order"""
+        expansions = []
+        capped = False
+        for i, token in enumerate(term.tokens):
+            expanded, token_capped = self._expand(token, term.prefix and i == len(term.tokens) - 1)
+            if not expanded:
+                return set(), False
+            expansions.append(expanded)
+            capped = capped or token_capped
+
+        # Intersect starting from the shortest posting lists
+        expansions.sort(key=lambda tokens: sum(len(self.postings[t]) for t in tokens))
+        chunk_ids = self._chunk_ids(expansions[0], lo, hi)
+        for tokens in expansions[1:]:
+            if not chunk_ids:
+                break
+            chunk_ids &= self._chunk_ids(tokens, lo, hi)
+        return chunk_ids, capped
+
+    @staticmethod
+    def _term_ranges(term: QueryTerm, tokens: List[str]) -> List[Tuple[int, int]]:
+        """Token offset ranges where a term occurs in one chunk's tokens"""
+        size = len(term.tokens)
+        ranges = []
+        for start in range(len(tokens) - size + 1):
+            if all(tokens[start + i] == term.tokens[i] for i in range(size - 1)):
+                last = tokens[start + size - 1]
+                if last == term.tokens[-1] or (term.prefix and last.startswith(term.tokens[-1])):
+                    ranges.append((start, start + size))
+        return ranges
+
+    def search(self, query: str, speaker: Optional[str] = None, start_time: Optional[datetime] = None,
+               end_time: Optional[datetime] = None, limit: int = 50, offset: int = 0,
+               snippet_chars: int = 80) -> Dict:
+        """Find chunks matching every query term, filtered by speaker and time range.
+
+        total is exact unless the query has a multi-word phrase and the page was
+        filled before every candidate was checked; total_exact says which.
+        """
+        terms = parse_query(query)
+        if not terms:
+            return {"total": 0, "total_exact": True, "results": []}
+
+        lo = bisect_left(self.timestamps, start_time.timestamp()) if start_time else 0
+        hi = bisect_right(self.timestamps, end_time.timestamp()) if end_time else len(self.timestamps)
+
+        # Resolve the most selective term first and stop once nothing is left
+        chunk_ids = None
+        prefix_capped = False
+        for term in sorted(terms, key=self._estimate):
+            term_ids, capped = self._candidates(term, lo, hi)
+            chunk_ids = term_ids if chunk_ids is None else chunk_ids & term_ids
+            prefix_capped = prefix_capped or capped
+            if not chunk_ids:
+                break
+
+        if speaker is not None:
+            chunk_ids = {chunk_id for chunk_id in chunk_ids if self.speakers[chunk_id] == speaker}
+        candidates = sorted(chunk_ids)
+
+        # Only phrases can turn out not to match; check them while filling the page
+        needs_check = any(len(term.tokens) > 1 for term in terms)
+        skipped = 0 if needs_check else min(offset, len(candidates))
+        matched = skipped
+        checked = skipped
+        results = []
+        for chunk_id in candidates[skipped:]:
+            if len(results) >= limit:
+                break
+            checked += 1
+            tokens = tokenize(self.texts[chunk_id])
+            words = [token for token, _, _ in tokens]
+            term_ranges = [self._term_ranges(term, words) for term in terms]
+            if not all(term_ranges):
+                continue
+            matched += 1
+            if matched <= offset:
+                continue
+            spans = [(start, end) for _, start, end in tokens]
+            ranges = [r for ranges in term_ranges for r in ranges]
+            snippet, highlights = self._snippet(self.texts[chunk_id], spans, ranges, snippet_chars)
+            results.append({
+                "chunk_id": chunk_id,
+                "timestamp": datetime.fromtimestamp(self.timestamps[chunk_id]).isoformat(),
+                "speaker": self.speakers[chunk_id],
+                "snippet": snippet,
+                "highlights": highlights
+            })
+
+        total_exact = not needs_check or checked == len(candidates)
+        response = {
+            "total": matched if needs_check and total_exact else len(candidates),
+            "total_exact": total_exact,
+            "results": results
+        }
+        if prefix_capped:
+            response["prefix_truncated"] = True
+        return response
+
+    def _estimate(self, term: QueryTerm) -> int:
+        """Rough posting count for a term, used to order intersections"""
+        if term.prefix and len(term.tokens) == 1:
+            start = bisect_left(self.vocabulary, term.tokens[0])
+            end = bisect_left(self.vocabulary, term.tokens[0] + "\uffff")
+            return end - start
+        return min(len(self.postings.get(token, ())) for token in term.tokens)
+
+    @staticmethod
+    def _snippet(text: str, spans: List[Tuple[int, int]], token_ranges: List[Tuple[int, int]],
+                 snippet_chars: int) -> Tuple[str, List[List[int]]]:
+        """Cut a window of text around the first match and return highlight spans in it"""
+        char_ranges = sorted((spans[start][0], spans[end - 1][1]) for start, end in token_ranges)
+
+        first_start, first_end = char_ranges[0]
+        padding = max(0, (snippet_chars - (first_end - first_start)) // 2)
+        window_start = max(0, first_start - padding)
+        window_end = min(len(text), first_end + padding)
+
+        snippet = text[window_start:window_end]
+        highlights = [
+            [start - window_start, end - window_start]
+            for start, end in char_ranges
+            if start >= window_start and end <= window_end
+        ]
+        if window_start > 0:
+            snippet = "..." + snippet
+            highlights = [[start + 3, end + 3] for start, end in highlights]
+        if window_end < len(text):
+            snippet += "..."
+        return snippet, highlights